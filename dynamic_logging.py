@@ -6,19 +6,37 @@
     Author - anupshinde.business@gmail.com
 """
 import os
+import re
 import time
+import queue
+import select
 import serial
 import logging
 import datetime
-from concurrent.futures import ThreadPoolExecutor
-from pyubx2 import UBXReader, UBX_PROTOCOL
-from serial.serialutil import SerialException
+import threading
+from multiprocessing import Process
+from pyubx2 import UBXReader, UBX_PROTOCOL, PARSE_NONE, PARSE_FULL
+from serial.serialutil import SerialException, Timeout
 
 # Global configuration
 SELECT_LOGGING = 4  # 1 = Both, 2 = Only GNSS, 3 = Only MODEM, 4 = Pump MODEM
 DEBUG = False  # Set to True for debugging
-TIMES_RETRY = 15  # Set value 0 - 15 to wait and try to check LTE NW registered
+USE_PROCESSES = True  # Set False to run gnss and modem logging as threads of one process
+GNSS_RT_PRIORITY = 20  # SCHED_RR priority requested for the gnss reader on Linux, needs CAP_SYS_NICE
+NW_SEARCH_TIMEOUT = 30  # Seconds to wait for LTE NW registration after configuring the modem
 OUTPUT_FOLDER = "output"
+NW_REATTACH_TIMEOUT = 20  # Seconds to wait for LTE NW after leaving flight mode
+FLIGHT_MODE_DURATION = 10  # Seconds to stay in flight mode so gnss takes few logs without modem activity
+GNSS_RAW_LOGGING = True  # Set False to log decoded UBX text instead of raw UBX frames as hex
+LOG_FILE_BUFFER_SIZE = 1 << 20  # Bytes buffered in userspace per gnss/modem log file
+LOG_WRITER_QUEUE_SIZE = 10000  # Records queued for a log writer thread before new records are dropped
+GNSS_FLUSH_INTERVAL = 1.0  # Seconds between flushes of the gnss log file buffer
+GNSS_FSYNC_INTERVAL = 1.0  # Seconds between fsync checkpoints of the gnss log
+MODEM_FLUSH_INTERVAL = 0  # Seconds between flushes of the modem log file buffer, 0 flushes after every AT poll
+MODEM_FSYNC_INTERVAL = 30  # Seconds between fsync checkpoints of the modem log
+SERIAL_RX_BUFFER_SIZE = 256 * 1024  # Driver receive buffer requested on Windows, default 4096 bytes overruns at 230400 baud
+SERIAL_TX_BUFFER_SIZE = 64 * 1024  # Driver transmit buffer requested on Windows
+MODEM_READ_TIMEOUT = 0.1  # Seconds a single modem port read may block while waiting for the final result code
 
 """FOR READERS: set of commands required to config modem for LTE technology
     commands:
@@ -54,6 +72,11 @@ signal_commands = ['AT+CESQ',
                    'AT#SGACT=1,0',
                    'AT#SGACT=1,1']
 
+# final result codes that end an AT command response
+at_terminators = (b"\r\nOK\r\n", b"\r\nERROR\r\n")
+# AT#SSEND answers with the "\r\n> " data prompt instead of a final result code
+ssend_terminators = (b"> ",) + at_terminators
+
 nw_eps_reg_status = "AT+CEREG?"
 nw_reg_status = "AT+CREG?"
 
@@ -67,6 +90,11 @@ message_to_server = ['AT#SSEND=1',
 socket_commands = ['AT#SI',
                    'AT#SS']
 
+# response lines kept by the modem status parsers, each found in a single scan of the response
+sock_status_re = re.compile(r"^(?:#SI: 1|#SS: 1)[^\r\n]*", re.MULTILINE)
+nw_status_re = re.compile(r"^(?:\+CEREG:|\+CREG:|\+COPS:)[^\r\n]*", re.MULTILINE)
+rf_status_re = re.compile(r"^#RFSTS:[^\r\n]*", re.MULTILINE)
+
 msg_in_response = "TCP_TEST_OK"
 
 message_from_server = "AT#SRECV=1,1500"
@@ -78,6 +106,15 @@ cops_check_command = "AT+COPS?"
 flight_mode_commands = ['AT+CFUN=1',
                         'AT+CFUN=4']
 pump_dummy_msg = 'aasdgajgfsdfhgafdsakjfgadskjfgiweuryaioweuryiuwyfhaksjdbvdsmbvkdshakfhdaklsfhklahfksdfhakdashfklsdhfkasdfkshalkfhafklhdsafdksjahfkdashfklahfdklsajfhkasdhfahieuwryioqyeifofiufbvyiyviyvqioiqoviuytvqiobyvqotbvyqtvyqoityvqoitbvqtvbytebvqityvetbvyitvybtvqiytqboitvyotvyqityqiwebvotyibwevytibvweytiwytvibakhksgdkjasj\x1a'
+pump_dummy_payload = (pump_dummy_msg + "\r\n").encode("latin-1")  # sent as is by pump_data_to_server
+
+# AT commands encoded once at load, com_port_read_write encodes anything else per call
+encoded_commands = {command: f"{command}\r\n".encode("ascii")
+                    for command in (cfg_commands + signal_commands + tcp_connect_commands + message_to_server
+                                    + socket_commands + flight_mode_commands
+                                    + [nw_eps_reg_status, nw_reg_status, message_from_server,
+                                       rf_status_command, cops_check_command, 'AT#SH=1'])}
+
 # Create output folder if it doesn't exist
 if not os.path.exists(OUTPUT_FOLDER):
     os.mkdir(OUTPUT_FOLDER)
@@ -86,48 +123,208 @@ if not os.path.exists(OUTPUT_FOLDER):
 date_time_now = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
 DYNAMIC_LOGGING_LOG_FILE = os.path.join(OUTPUT_FOLDER, f"dynamic_logging_{date_time_now}.log")
 
-logging.basicConfig(level=logging.DEBUG if DEBUG else logging.INFO,
-                    format='%(asctime)s - %(levelname)s - %(message)s',
-                    handlers=[
-                        logging.FileHandler(DYNAMIC_LOGGING_LOG_FILE),
-                        logging.StreamHandler()
-                    ])
+
+def configure_logging(log_file=DYNAMIC_LOGGING_LOG_FILE):
+    """Configures logging, called again in each logging process as spawned processes start without handlers.
+
+    Spawned processes import the module again with a new timestamp, so they get the log file of the main process.
+    """
+    logging.basicConfig(level=logging.DEBUG if DEBUG else logging.INFO,
+                        format='%(asctime)s - %(levelname)s - %(message)s',
+                        handlers=[
+                            logging.FileHandler(log_file),
+                            logging.StreamHandler()
+                        ])
+
+
 logger = logging.getLogger(__name__)
 
+# per thread cache of the last formatted log record timestamp
+timestamp_cache = threading.local()
+# log writers started and not closed yet, so an interrupted main thread can close those of its worker threads
+open_log_writers = set()
+
+
+def cached_timestamp():
+    """Returns the current log record timestamp as (str, bytes), formatted only when the second changes."""
+    now = int(time.time())
+    if getattr(timestamp_cache, "second", None) != now:
+        text = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+        timestamp_cache.second = now
+        timestamp_cache.value = (text, text.encode("ascii"))
+    return timestamp_cache.value
+
+
+class LogWriter(threading.Thread):
+    """Writes queued log records to a file on a background thread, so serial loops never wait on disk I/O.
+
+    Records are written in batches to the buffered file, which is flushed every flush_interval seconds
+    and synced every fsync_interval seconds.
+    """
+
+    def __init__(self, file_path, flush_interval, fsync_interval):
+        super().__init__(name=f"log_writer_{os.path.basename(file_path)}", daemon=True)
+        self.file_path = file_path
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self.records = queue.Queue(maxsize=LOG_WRITER_QUEUE_SIZE)
+        self.dropped = 0
+        self.error = None
+        open_log_writers.add(self)
+
+    def put(self, record):
+        """Queues an encoded record, dropping it when the queue is full as losing serial bytes is worse.
+
+        Raises the error that stopped the writer, as nothing queued after it is ever written.
+        """
+        if self.error is not None or not self.is_alive():
+            raise OSError(f"LogWriter: {self.file_path} writer stopped: {self.error}") from self.error
+        try:
+            self.records.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped % 1000 == 1:
+                logger.warning(f"LogWriter: {self.file_path} queue full, dropped {self.dropped} records so far")
+
+    def close(self):
+        """Writes and syncs all queued records, then stops the writer."""
+        while self.is_alive():
+            try:
+                self.records.put(None, timeout=0.5)
+                break
+            except queue.Full:
+                continue  # the writer is still draining the queue, or stopped on an error
+        self.join()
+        open_log_writers.discard(self)
+        if self.error is not None:
+            logger.error(f"LogWriter: {self.file_path} writer stopped on error, records were lost: {self.error}")
+
+    def run(self):
+        try:
+            self.write_records()
+        except OSError as e:
+            self.error = e
+
+    def write_records(self):
+        last_flush = last_fsync = time.monotonic()
+        with open(self.file_path, "ab", buffering=LOG_FILE_BUFFER_SIZE) as f:
+            while True:
+                batch = [self.records.get()]
+                while batch[-1] is not None:
+                    try:
+                        batch.append(self.records.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = batch[-1] is None
+                if stop:
+                    batch.pop()
+                f.write(b"".join(batch))  # the file buffer only reaches the OS when it is full or flushed
+                now = time.monotonic()
+                sync = stop or now - last_fsync >= self.fsync_interval
+                if sync or now - last_flush >= self.flush_interval:
+                    f.flush()  # survives the logger being killed, only an fsync survives a power loss
+                    last_flush = now
+                if sync:
+                    os.fsync(f.fileno())
+                    last_fsync = now
+                if stop:
+                    break
+
 
 def create_log_file(base_name):
     """Creates a new log file with a timestamped name in the output folder."""
     timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     log_file_path = os.path.join(OUTPUT_FOLDER, f"{base_name}_{timestamp}.log")
-    logger.debug(f"create_log_file: New log file generated for {base_name}: {log_file_path}")
+    logger.debug("create_log_file: New log file generated for %s: %s", base_name, log_file_path)
     return log_file_path
 
 
-def start_serial_connection(port, baud_rate):
+def start_serial_connection(port, baud_rate, timeout=None):
     """Starts serial connections to GNSS: baud 230400 and modem: baud 115200 ports."""
     try:
         logger.info("start_serial_connection: Connecting to COM ports...")
-        return serial.Serial(port, baud_rate)
+        ser = serial.Serial(port, baud_rate, timeout=timeout)
+        if hasattr(ser, 'set_buffer_size'):  # Windows only
+            ser.set_buffer_size(rx_size=SERIAL_RX_BUFFER_SIZE, tx_size=SERIAL_TX_BUFFER_SIZE)
+        if hasattr(ser, 'set_low_latency_mode'):  # Linux only, drops USB serial latency timer from 16ms to 1ms
+            try:
+                ser.set_low_latency_mode(True)
+            except ValueError as e:
+                logger.info(f"start_serial_connection: low latency mode not supported on {port}: {e}")
+        time.sleep(0.1)  # let the driver settle before dropping bytes queued while the port opened
+        ser.reset_input_buffer()
+        return ser
     except SerialException as e:
         logger.error(f"start_serial_connection: Error connecting to COM ports: {e}")
         return None
 
 
-def com_port_read_write(port, command, max_timeout=3):
-    """Sends a command to the specified serial port and returns the response."""
+def read_until_terminator(port, terminators, max_timeout):
+    """Reads from the serial port until the data ends with one of the terminators or max_timeout expires.
+
+    On POSIX the port descriptor is waited on with select, so the read returns as soon as the terminator
+    arrives, elsewhere the port is polled with reads bounded by the port timeout.
+    """
+    response = bytearray()
+    timeout = Timeout(max_timeout)
+    read, expired = port.read, timeout.expired  # bound once, looked up on every poll
+    if os.name == "posix":
+        fd = port.fileno()
+        while not response.endswith(terminators) and not expired():
+            ready, _, _ = select.select([fd], [], [], timeout.time_left())
+            if ready:
+                response += read(max(1, port.in_waiting))
+    else:
+        while not response.endswith(terminators) and not expired():
+            response += read(max(1, port.in_waiting))
+    return response
+
+
+def port_write_bytes(port, payload, max_timeout=3, terminators=at_terminators):
+    """Writes an already encoded payload to the specified serial port and returns the response.
+
+    Reading stops as soon as the response ends with one of the terminators,
+    max_timeout only bounds commands the modem never completes.
+    """
     try:
-        port.flush()
-        port.write(f"{command}\r\n".encode())
-        port.timeout = max_timeout
-        response = port.readall().decode().strip()
-        logger.debug(f"com_port_read_write: Writing to port: {port} command: {command} response: {response}")
+        port.write(payload)
+        response = read_until_terminator(port, terminators, max_timeout)
+        response = response.decode("latin-1").strip()  # never drop a response over a stray noise byte
+        logger.debug("port_write_bytes: Writing to port: %s payload: %s response: %s", port, payload, response)
         return response
-    except (UnicodeDecodeError, SerialException) as e:
-        logger.error(f"com_port_read_write: Error reading from serial port: {e}")
+    except SerialException as e:
+        logger.error(f"port_write_bytes: Error reading from serial port: {e}")
         return None
 
 
-def configure_sim_module(com_port, config_commands, max_retries=15):
+def com_port_read_write(port, command, max_timeout=3, terminators=at_terminators):
+    """Sends a command to the specified serial port and returns the response."""
+    payload = encoded_commands.get(command) or f"{command}\r\n".encode("ascii", errors="ignore")
+    return port_write_bytes(port, payload, max_timeout, terminators)
+
+
+def wait_for_cops_registered(port, max_wait=20, initial_delay=0.5, max_delay=4.0):
+    """Polls AT+COPS? with exponential backoff until LTE is registered, returns False after max_wait seconds."""
+    start_search_nw = time.monotonic()
+    delay = initial_delay
+    while True:
+        cops_response = com_port_read_write(port, cops_check_command, 2)
+        if cops_response is not None and '8' in cops_response:
+            logger.info(f"wait_for_cops_registered: LTE Network registered, "
+                        f"time to register nw :{time.monotonic() - start_search_nw:.2f} seconds")
+            return True
+        remaining = max_wait - (time.monotonic() - start_search_nw)
+        if remaining <= 0:
+            logger.info(f"wait_for_cops_registered: LTE Network not registered after {max_wait} seconds, "
+                        f"cops response: {cops_response}")
+            return False
+        logger.info(f"wait_for_cops_registered: cops response: {cops_response} Searching for LTE network. "
+                    f"Retry in {min(delay, remaining):.2f} seconds")
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, max_delay)
+
+
+def configure_sim_module(com_port, config_commands, max_wait=30):
     """Configures the SIM module with the given commands."""
     config_responses = []
     for command in config_commands:
@@ -139,21 +336,10 @@ def configure_sim_module(com_port, config_commands, max_retries=15):
                 logger.error(f"configure_sim_module: config SIM returned "
                              f"ERROR for command {command}:{cfg_response}")
                 return False
-    logger.debug(config_responses)
+    logger.debug("configure_sim_module: config responses: %s", config_responses)
     logger.info("configure_sim_module: Configuration Success, Rebooting Modem...")
     time.sleep(2)
-    start_search_nw = time.time()
-    for attempt in range(max_retries):
-        cops_response = com_port_read_write(com_port, cops_check_command, 2)
-        if cops_response is not None:
-            if '8' in cops_response:
-                logger.info(f"configure_sim_module: LTE Network registered and roaming, "
-                            f"time to register nw :{time.time() - start_search_nw:.2f} seconds")
-                return True
-            else:
-                logger.info(f"configure_sim_module: cops response: {cops_response} Searching for LTE network. "
-                            f"Retry {attempt + 1}/{max_retries}\n")
-                time.sleep(1)
+    return wait_for_cops_registered(com_port, max_wait, initial_delay=0.25)
 
 
 def pump_data_to_server(port, max_msg_count):
@@ -162,9 +348,9 @@ def pump_data_to_server(port, max_msg_count):
     server_response = com_port_read_write(port, 'AT#SD=1,0,7,"echo.u-blox.com",0,0,1', 10)
     logger.info(f"pump_data_to_server: server_response: {server_response}")
     while max_msg_count:
-        send_response = com_port_read_write(port, 'AT#SSEND=1', 5)
+        send_response = com_port_read_write(port, 'AT#SSEND=1', 5, ssend_terminators)
         logger.info(f"pump_data_to_server: send_response: {send_response}")
-        msg_response = com_port_read_write(port, pump_dummy_msg, 5)
+        msg_response = port_write_bytes(port, pump_dummy_payload, 5)
         logger.info(f"pump_data_to_server:{max_msg_count} msg_response: {msg_response}")
         if msg_response is not None and 'OK' not in msg_response:
             break
@@ -181,75 +367,65 @@ def tcp_connection_test(port, tcp_commands, msg_to_commands, msg_from_command, s
         logger.info(f"tcp_connection_test: server_response: {server_response}")
 
     for command in msg_to_commands:
-        msg_response = com_port_read_write(port, command, 1)
-        logger.debug(f"tcp_connection_test: message response: {msg_response}")
+        terminators = ssend_terminators if command.startswith('AT#SSEND') else at_terminators
+        msg_response = com_port_read_write(port, command, 1, terminators)
+        logger.debug("tcp_connection_test: message response: %s", msg_response)
 
     response = com_port_read_write(port, msg_from_command, 1)
-    logger.debug(f"tcp_connection_test: response from server : {response}")
+    logger.debug("tcp_connection_test: response from server : %s", response)
     if response is not None:
-        lines = response.splitlines()
         message_response.append("#MSG:")
-        for line in lines:
-            if msg_in_response in line:
-                # logger.info(f"tcp_connection_test:  response from server is : {line}")
-                message_response.append(line)
-                break
+        msg_index = response.find(msg_in_response)
+        if msg_index >= 0:
+            # slice out only the line holding the echoed message
+            line_start = response.rfind("\n", 0, msg_index) + 1
+            line_end = response.find("\n", msg_index)
+            line = response[line_start:] if line_end < 0 else response[line_start:line_end]
+            message_response.append(line.rstrip("\r"))
     else:
         message_response.append("#MSG: None")
 
     for command in sock_commands:
         sock_response = com_port_read_write(port, command, 1)
-        logger.debug(f"tcp_connection_test: socket response: {sock_response}")
+        logger.debug("tcp_connection_test: socket response: %s", sock_response)
         if sock_response is not None:
-            lines = sock_response.splitlines()
-            for line in lines:
-                if line.startswith("#SI: 1"):
-                    logger.debug(f"tcp_connection_test: #SI socket response in line: {line}")
-                    message_response.append(line)
-                    break
-                elif line.startswith("#SS: 1"):
-                    logger.debug(f"tcp_connection_test: #SS socket response in line: {line}")
-                    message_response.append(line)
-                    break
+            sock_match = sock_status_re.search(sock_response)
+            if sock_match is not None:
+                logger.debug("tcp_connection_test: socket response in line: %s", sock_match.group())
+                message_response.append(sock_match.group())
 
-    return " ".join(str(item) for item in message_response)
+    return " ".join(message_response)
 
 
 def check_network_status(port, command):
     response = []
     nw_stat_response = com_port_read_write(port, command, 1)
     if nw_stat_response is not None:
-        lines = nw_stat_response.splitlines()
-        for line in lines:
-            if line.startswith("+CEREG:") or line.startswith("+CREG:") or line.startswith("+COPS:"):
-                logger.debug(f"check_network_status:  network status is : {line}")
-                response.append(line)
+        response = nw_status_re.findall(nw_stat_response)
+        logger.debug("check_network_status:  network status is : %s", response)
     else:
-        logger.debug(f"check_network_status: Failed get network status for command {command} : {nw_stat_response}")
-    return " ".join(str(item) for item in response)
+        logger.debug("check_network_status: Failed get network status for command %s : %s", command, nw_stat_response)
+    return " ".join(response)
 
 
 def check_rf_status(port, command):
     response = []
     rf_status_responses = com_port_read_write(port, command, 2)
-    logger.debug(f"check_rf_status: {rf_status_responses}")
+    logger.debug("check_rf_status: %s", rf_status_responses)
     if rf_status_responses is not None:
-        lines = rf_status_responses.splitlines()
-        for line in lines:
-            if line.startswith("#RFSTS:"):
-                logger.debug(f"check_rf_status: check RF status: {line}")
-                response.append(line)
+        response = rf_status_re.findall(rf_status_responses)
+        logger.debug("check_rf_status: check RF status: %s", response)
     else:
-        logger.debug(f"check_rf_status: Failed to check RF status: {rf_status_responses}")
-    return " ".join(str(item) for item in response)
+        logger.debug("check_rf_status: Failed to check RF status: %s", rf_status_responses)
+    return " ".join(response)
 
 
 def pump_modem_data_with_flight_mode(com_port, sig_commands, config_commands, phone_mode_commands):
     """ Pump modem data while flight mode on or off and logs into file"""
-    modem_configured = configure_sim_module(com_port, config_commands, TIMES_RETRY)  # configure modem
+    modem_configured = configure_sim_module(com_port, config_commands, NW_SEARCH_TIMEOUT)  # configure modem
     if modem_configured:
         modem_log_file = create_log_file("modem")
-        with open(modem_log_file, "a", encoding='utf-8') as f:
+        with open(modem_log_file, "a", encoding='utf-8', buffering=LOG_FILE_BUFFER_SIZE) as f:
             for command in sig_commands:
                 stat_response = com_port_read_write(com_port, command, 2)  # log modem signals
                 if stat_response is not None:
@@ -266,25 +442,21 @@ def pump_modem_data_with_flight_mode(com_port, sig_commands, config_commands, ph
                     logger.info(f"pump_modem_data_with_flight_mode: mode set to: {command} "
                                 f"mode_response: {phone_mode_response}")
                     if '1' in command:
-                        time.sleep(10)  # allow modem to connect back to network
-                        cops_response = com_port_read_write(com_port, cops_check_command, 2)
-                        logger.info(f"pump_modem_data_with_flight_mode: Confirming nw "
-                                    f"is attached to modem, cops: {cops_response}")
-                        if cops_response is not None:
-                            if '8' in cops_response:
-                                timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-                                f.write(f"{timestamp}:'#Pumping Data To Server...'\n")
-                                f.flush()
-                                os.fsync(f)
-                                logger.info(f"Start time of pump modem data : {time.strftime('%Y-%m-%d %H:%M:%S')}")
-                                pump_data_to_server(com_port, 5)
-                                logger.info(f"End time of pump modem data : {time.strftime('%Y-%m-%d %H:%M:%S')}")
+                        # poll until modem connects back to network instead of a fixed wait
+                        if wait_for_cops_registered(com_port, NW_REATTACH_TIMEOUT):
+                            timestamp = cached_timestamp()[0]
+                            f.write(f"{timestamp}:'#Pumping Data To Server...'\n")
+                            f.flush()
+                            os.fsync(f.fileno())
+                            logger.info(f"Start time of pump modem data : {time.strftime('%Y-%m-%d %H:%M:%S')}")
+                            pump_data_to_server(com_port, 5)
+                            logger.info(f"End time of pump modem data : {time.strftime('%Y-%m-%d %H:%M:%S')}")
                     elif '4' in command:
-                        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+                        timestamp = cached_timestamp()[0]
                         f.write(f"{timestamp}:'#Flight Mode Active...'\n")
                         f.flush()
-                        os.fsync(f)
-                    time.sleep(10)  # allow gnss to take few logs with flight mode active
+                        os.fsync(f.fileno())
+                        time.sleep(FLIGHT_MODE_DURATION)  # allow gnss to take few logs with flight mode active
     else:
         logger.info("pump_modem_data_with_flight_mode: Failed to configure modem..\n")
 
@@ -292,10 +464,11 @@ def pump_modem_data_with_flight_mode(com_port, sig_commands, config_commands, ph
 def read_and_log_modem_data(com_port, sig_commands, rf_command, nw_eps_command,
                             nw_command, config_commands):
     """Reads and logs data from the modem port asynchronously."""
-    modem_configured = configure_sim_module(com_port, config_commands, TIMES_RETRY)  # configure modem
+    modem_configured = configure_sim_module(com_port, config_commands, NW_SEARCH_TIMEOUT)  # configure modem
     if modem_configured:
-        modem_log_file = create_log_file("modem")
-        with open(modem_log_file, "a", encoding='utf-8') as f:
+        writer = LogWriter(create_log_file("modem"), MODEM_FLUSH_INTERVAL, MODEM_FSYNC_INTERVAL)
+        writer.start()
+        try:
             for command in sig_commands:
                 stat_response = com_port_read_write(com_port, command, 2)  # log modem signals
                 if stat_response is not None:
@@ -306,6 +479,7 @@ def read_and_log_modem_data(com_port, sig_commands, rf_command, nw_eps_command,
                                 f"for signal status responded None")
 
             logger.info("read_and_log_modem_data: Started logging into file...\n")
+            put, now_timestamp = writer.put, cached_timestamp
             while True:
                 tcp_status = tcp_connection_test(com_port, tcp_connect_commands,
                                                  message_to_server, message_from_server,
@@ -314,51 +488,66 @@ def read_and_log_modem_data(com_port, sig_commands, rf_command, nw_eps_command,
                 nw_status = check_network_status(com_port, nw_command)
                 rf_status = check_rf_status(com_port, rf_command)
 
-                timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-                logger.debug(
-                    f"read_and_log_modem_data: Writing to file timestamp appended "
-                    f"RF status response and NTP response: {timestamp}+{rf_status}+{tcp_status}+"
-                    f"{nw_eps_status}+{nw_status}\n")
-                f.write(f"{timestamp}:{rf_status}:{tcp_status}:{nw_eps_status}:{nw_status}\n")
-                f.flush()
-                os.fsync(f)
+                timestamp = now_timestamp()[0]
+                logger.debug("read_and_log_modem_data: Writing to file timestamp appended "
+                             "RF status response and NTP response: %s+%s+%s+%s+%s\n",
+                             timestamp, rf_status, tcp_status, nw_eps_status, nw_status)
+                put(f"{timestamp}:{rf_status}:{tcp_status}:{nw_eps_status}:{nw_status}\n".encode())
+        finally:
+            writer.close()
     else:
         logger.info("read_and_log_modem_data: Failed to configure modem..\n")
 
 
 def read_and_log_gnss_data(com_port):
-    """Reads and logs data from the GNSS port."""
-    gnss_log_file = create_log_file("gnss")
-    with open(gnss_log_file, "a") as f:
-        while True:
-            ubx_raw_data = UBXReader(com_port, protfilter=UBX_PROTOCOL)
-            if ubx_raw_data is not None:
-                for raw_data, ubx_data in ubx_raw_data:
-                    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-                    logger.debug(
-                        f"read_and_log_gnss_data: Writing to file timestamp appended "
-                        f"UBX data frames: {timestamp}+{ubx_data}\n")
-                    f.write(f"{timestamp}:{ubx_data}\n")
-                    f.flush()
-                    os.fsync(f)
+    """Reads and logs data from the GNSS port, handing UBX frames to a LogWriter thread.
+
+    With GNSS_RAW_LOGGING frames are logged as hex and decoded offline by the parser,
+    the reader then only frames the stream instead of parsing and formatting every UBX field.
+    """
+    writer = LogWriter(create_log_file("gnss"), GNSS_FLUSH_INTERVAL, GNSS_FSYNC_INTERVAL)
+    writer.start()
+    # blocking port, iterates until the port closes
+    ubx_reader = UBXReader(com_port, protfilter=UBX_PROTOCOL, parsing=PARSE_NONE if GNSS_RAW_LOGGING else PARSE_FULL)
+    # bind per frame lookups to locals, the loop runs for every UBX frame
+    put, now_timestamp = writer.put, cached_timestamp
+    raw_logging, is_debug = GNSS_RAW_LOGGING, logger.isEnabledFor(logging.DEBUG)
+    try:
+        for raw_data, ubx_data in ubx_reader:
+            timestamp, timestamp_bytes = now_timestamp()
+            if is_debug:
+                logger.debug("read_and_log_gnss_data: Queueing timestamp appended "
+                             "UBX data frames: %s+%s\n", timestamp, raw_data.hex() if raw_logging else ubx_data)
+            if raw_logging:
+                put(b"%s:%s\n" % (timestamp_bytes, raw_data.hex().encode("ascii")))
             else:
-                logger.debug(f"read_and_log_gnss_data: UBX raw data responded NONE")
-
-
-def start_gnss_thread(port):
+                put(f"{timestamp}:{ubx_data}\n".encode())
+    finally:
+        writer.close()  # write frames still queued when the reader stopped
+
+
+def start_gnss_thread(port, log_file=DYNAMIC_LOGGING_LOG_FILE):
+    configure_logging(log_file)
+    if hasattr(os, "sched_setscheduler"):
+        # let the gnss reader drain the 230400 baud stream ahead of other work
+        try:
+            os.sched_setscheduler(0, os.SCHED_RR, os.sched_param(GNSS_RT_PRIORITY))
+        except OSError as e:
+            logger.info(f"start_gnss_thread: keeping default scheduling, could not set SCHED_RR: {e}")
     logger.info(f"start_gnss_thread: Starting GNSS serial connection on port {port}")
     ser = start_serial_connection(port, 230400)
-    logger.debug(f"start_gnss_thread: gnss serial connections established {ser}")
+    logger.debug("start_gnss_thread: gnss serial connections established %s", ser)
     if ser is not None:
         read_and_log_gnss_data(ser)
     else:
         logger.info("start_gnss_thread: failed to get gnss serial connection")
 
 
-def start_modem_thread(port):
+def start_modem_thread(port, log_file=DYNAMIC_LOGGING_LOG_FILE):
+    configure_logging(log_file)
     logger.info(f"start_modem_thread: Starting Modem serial connection on port {port}")
-    ser = start_serial_connection(port, 115200)
-    logger.debug(f"start_modem_thread: modem serial connections established {ser}")
+    ser = start_serial_connection(port, 115200, MODEM_READ_TIMEOUT)
+    logger.debug("start_modem_thread: modem serial connections established %s", ser)
     if ser is not None:
         read_and_log_modem_data(ser, signal_commands, rf_status_command,
                                 nw_eps_reg_status, nw_reg_status, cfg_commands)
@@ -366,10 +555,11 @@ def start_modem_thread(port):
         logger.info("start_modem_thread: failed to get modem serial connection")
 
 
-def start_pump_modem_thread(port):
+def start_pump_modem_thread(port, log_file=DYNAMIC_LOGGING_LOG_FILE):
+    configure_logging(log_file)
     logger.info(f"start_pump_modem_thread: Starting Modem serial connection on port {port}")
-    ser = start_serial_connection(port, 115200)
-    logger.debug(f"start_pump_modem_thread: modem serial connections established {ser}")
+    ser = start_serial_connection(port, 115200, MODEM_READ_TIMEOUT)
+    logger.debug("start_pump_modem_thread: modem serial connections established %s", ser)
     if ser is not None:
         pump_modem_data_with_flight_mode(ser, signal_commands, cfg_commands,
                                          flight_mode_commands)
@@ -378,20 +568,38 @@ def start_pump_modem_thread(port):
 
 
 def run_io_tasks_in_parallel(tasks):
-    with ThreadPoolExecutor() as executor:
-        running_tasks = [executor.submit(task) for task in tasks]
-        for running_task in running_tasks:
-            running_task.result()
+    """Runs each named (target, args) task in its own process, or in a daemon thread without USE_PROCESSES.
+
+    Daemon threads are killed at exit without running their finally blocks, so on Ctrl-C their log writers
+    are closed here. The threads stay daemons as the gnss reader blocks on its port and would hang the exit.
+    """
+    if USE_PROCESSES:
+        workers = [Process(target=target, args=args, name=name) for name, (target, args) in tasks.items()]
+    else:
+        workers = [threading.Thread(target=target, args=args, name=name, daemon=True)
+                   for name, (target, args) in tasks.items()]
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        if not USE_PROCESSES:  # each worker process gets the interrupt itself and closes its own writer
+            logger.info("run_io_tasks_in_parallel: interrupted, writing queued log records")
+            for writer in list(open_log_writers):
+                writer.close()
+        raise
 
 
 if __name__ == "__main__":
+    configure_logging()
     match SELECT_LOGGING:
         case 1:
             logger.info("Main: SELECT_LOGGING set to Both")
-            run_io_tasks_in_parallel([
-                lambda: start_gnss_thread('COM4'),
-                lambda: start_modem_thread('COM8'),
-            ])
+            run_io_tasks_in_parallel({
+                "gnss": (start_gnss_thread, ('COM4', DYNAMIC_LOGGING_LOG_FILE)),
+                "modem": (start_modem_thread, ('COM8', DYNAMIC_LOGGING_LOG_FILE)),
+            })
         case 2:
             logger.info("Main: SELECT_LOGGING set to Only GNSS")
             logger.info("start_gnss_thread: Starting GNSS thread...")
@@ -403,9 +611,9 @@ if __name__ == "__main__":
         case 4:
             logger.info("Main: SELECT_LOGGING set to Pump MODEM")
             # start_pump_modem_thread('COM8')
-            run_io_tasks_in_parallel([
-                lambda: start_gnss_thread('COM4'),
-                lambda: start_pump_modem_thread('COM8'),
-            ])
+            run_io_tasks_in_parallel({
+                "gnss": (start_gnss_thread, ('COM4', DYNAMIC_LOGGING_LOG_FILE)),
+                "pump_modem": (start_pump_modem_thread, ('COM8', DYNAMIC_LOGGING_LOG_FILE)),
+            })
         case _:
             logger.info("Main: Unsupported SELECT_LOGGING type")
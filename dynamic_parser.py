@@ -5,14 +5,14 @@
         with older logging script may encounter unhandled errors
 """
 import os
-import statistics
 import numpy as np
 import pandas as pd
 import logging
 from datetime import datetime
 import time
+from concurrent.futures import ProcessPoolExecutor
 import folium
-from folium.plugins import HeatMap, MarkerCluster
+from folium.plugins import HeatMap, FastMarkerCluster
 
 # Global configuration
 DEBUG = False  # Set to True for debugging
@@ -26,13 +26,83 @@ date_time_now = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
 # Define input file paths (modify as needed)
 GNSS_LOG_FILE = os.path.join(OUTPUT_FOLDER, "gnss_2024-09-16_13-23-09.log")
 SIM_MODEM_LOG_FILE = os.path.join(OUTPUT_FOLDER, "modem_2024-09-16_13-23-58.log")
-OUTPUT_EXCEL_FILE = os.path.join(OUTPUT_FOLDER, f"performance_data_{date_time_now}.xlsx")
+OUTPUT_EXCEL_FILE = os.path.join(OUTPUT_FOLDER, f"performance_data_{date_time_now}.xlsx")  # or .parquet
 OUTPUT_MAP_FILE = os.path.join(OUTPUT_FOLDER, f"map_{date_time_now}.html")
 DYNAMIC_PARSER_LOG_FILE = os.path.join(OUTPUT_FOLDER, f"dynamic_parser_{date_time_now}.log")
 
+# timestamp format of the logging script
+LOG_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+# numeric value of a decoded UBX message field, e.g. "2.35" of "lon=2.35"
+UBX_NUMBER_RE = r"-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b"
+# integer value of a decoded UBX message field, e.g. "2024" of "year=2024"
+UBX_INTEGER_RE = r"-?\d+\b"
+# timestamp and message type of a decoded UBX log line, e.g. "2024-09-16 13:23:09:<UBX(NAV-PVT, ...)>"
+UBX_LINE_RE = r"^(?P<timestamp>[^<]*?)[^<]?<[^(]*\(\s*(?P<tag>[^,]*)"
+# constellation and CNo of one satellite of a decoded UBX NAV-SAT message split at "gnssId_"
+UBX_SAT_CNO_RE = r"^\d+=(?P<gnss_id>\w+),[^,]*,\s*cno_\d+=(?P<cno>\d+)"
+# column separator for reading whole log lines, never present in the logs
+LOG_LINE_SEPARATOR = "\x1f"
+# output columns of the NAV-PVT fields
+UBX_NAV_PVT_COLUMNS = {'fix_type': 'fixType', 'gnss_fix_ok': 'gnssFixOk', 'num_sv': 'numSV', 'lon': 'lon',
+                       'lat': 'lat', 'h_msl': 'hMSL', 'h_acc': 'hAcc', 'v_acc': 'vAcc', 'g_speed': 'gSpeed',
+                       's_acc': 'sAcc', 'head_acc': 'headAcc', 'p_dop': 'pDOP', 'head_veh': 'headVeh'}
+# dtype of the NAV-PVT fields of the UTC time and the output columns, scaled fields are decoded as floats
+UBX_NAV_PVT_FIELDS = {'year': 'UInt16', 'month': 'UInt8', 'day': 'UInt8', 'hour': 'UInt8', 'min': 'UInt8',
+                      'second': 'UInt8', 'fixType': 'UInt8', 'gnssFixOk': 'UInt8', 'numSV': 'UInt8',
+                      'lon': 'float64', 'lat': 'float64', 'hMSL': 'Int32', 'hAcc': 'UInt32', 'vAcc': 'UInt32',
+                      'gSpeed': 'Int32', 'sAcc': 'UInt32', 'headAcc': 'float64', 'pDOP': 'float64',
+                      'headVeh': 'float64'}
+# dtype of the NAV-STATUS fields
+UBX_NAV_STATUS_FIELDS = {'ttff': 'UInt32'}
+# timestamp and hex frame of a raw UBX log line, e.g. "2024-09-16 13:23:09:b56201..."
+UBX_RAW_LINE_RE = r"^(?P<timestamp>.*):\s*(?P<frame>[0-9A-Fa-f]+)\s*$"
+# message type of the class and id of a raw UBX frame
+UBX_MESSAGE_TYPES = {0x0107: 'NAV-PVT', 0x0135: 'NAV-SAT', 0x0103: 'NAV-STATUS'}
+# little endian layout of the NAV-PVT payload fields, gnssFixOk is bit 0 of flags
+UBX_NAV_PVT_PAYLOAD = np.dtype({
+    'names': ['year', 'month', 'day', 'hour', 'min', 'second', 'fixType', 'flags', 'numSV', 'lon', 'lat', 'hMSL',
+              'hAcc', 'vAcc', 'gSpeed', 'sAcc', 'headAcc', 'pDOP', 'headVeh'],
+    'formats': ['<u2', 'u1', 'u1', 'u1', 'u1', 'u1', 'u1', 'u1', 'u1', '<i4', '<i4', '<i4', '<u4', '<u4', '<i4', '<u4',
+                '<u4', '<u2', '<i4'],
+    'offsets': [4, 6, 7, 8, 9, 10, 20, 21, 23, 24, 28, 36, 40, 44, 60, 68, 72, 76, 84],
+    'itemsize': 92})
+# scale of the NAV-PVT fields sent as scaled integers
+UBX_NAV_PVT_SCALES = {'lon': 1e-7, 'lat': 1e-7, 'headAcc': 1e-5, 'pDOP': 0.01, 'headVeh': 1e-5}
+# decimals scaled values are rounded to, as pyubx2 does when decoding the text logs
+UBX_SCALE_ROUND = 12
+# little endian layout of the NAV-STATUS payload fields
+UBX_NAV_STATUS_PAYLOAD = np.dtype({'names': ['ttff'], 'formats': ['<u4'], 'offsets': [8], 'itemsize': 16})
+# constellation of the NAV-SAT gnssId values
+UBX_GNSS_IDS = {0: 'GPS', 1: 'SBAS', 2: 'Galileo', 3: 'BeiDou', 4: 'IMES', 5: 'QZSS', 6: 'GLONASS', 7: 'NAVIC'}
+# output column prefix of the NAV-SAT CNo statistics of each constellation
+UBX_CONSTELLATIONS = {'GPS': 'GPS', 'SBAS': 'SBAS', 'Galileo': 'Galileo', 'BeiDou': 'BeiDou', 'GLONASS': 'Glonass'}
+# columns of the parsed GNSS DataFrame
+GNSS_COLUMNS = ['timestamp', 'UTC-Time', 'numSVs', 'ttff', 'GPS-Avg', 'GPS-Max', 'GPS-CNO-G40', 'SBAS-Avg', 'SBAS-Max',
+                'SBAS-CNO-G40', 'Galileo-Avg', 'Galileo-Max', 'Galileo-CNO-G40', 'BeiDou-Avg', 'BeiDou-Max',
+                'BeiDou-CNO-G40', 'Glonass-Avg', 'Glonass-Max', 'Glonass-CNO-G40', 'fix_type', 'gnss_fix_ok',
+                'num_sv', 'lon', 'lat', 'h_msl', 'h_acc', 'v_acc', 'g_speed', 's_acc', 'head_acc', 'p_dop',
+                'head_veh']
+# ascending thresholds of the RSRP, RSSI, RSRQ and SINR values and the quality percentage below the first threshold
+# and from each threshold on
+RSRP_THRESHOLDS, RSRP_QUALITY = np.array([-111, -102, -84]), np.array([10, 20, 30, 40])
+RSSI_THRESHOLDS, RSSI_QUALITY = np.array([-85, -75, -65]), np.array([10, 20, 30, 40])
+RSRQ_THRESHOLDS, RSRQ_QUALITY = np.array([-6, -5]), np.array([10, 30, 40])
+SINR_THRESHOLDS, SINR_QUALITY = np.array([7, 10, 12.5]), np.array([10, 20, 30, 40])
+# leaflet marker of a [lat, lon, color, popup] row of the map marker cluster
+MAP_MARKER_CALLBACK = """
+    function (row) {
+        var icon = L.AwesomeMarkers.icon({icon: 'info-sign', prefix: 'glyphicon', markerColor: row[2]});
+        return L.marker(new L.LatLng(row[0], row[1]), {icon: icon}).bindPopup(row[3]);
+    }
+"""
+
 
-def configure_logging():
-    """Configures logging for the application."""
+def configure_logging(log_file=DYNAMIC_PARSER_LOG_FILE):
+    """Configures logging for the application.
+
+    Args:
+        log_file (str, optional): Path to the log file, shared with the parser worker processes.
+    """
     if not os.path.exists(OUTPUT_FOLDER):
         os.makedirs(OUTPUT_FOLDER)
 
@@ -40,7 +110,7 @@ def configure_logging():
         level=logging.DEBUG if DEBUG else logging.INFO,
         format="%(asctime)s - %(levelname)s - %(message)s",
         handlers=[
-            logging.FileHandler(DYNAMIC_PARSER_LOG_FILE),
+            logging.FileHandler(log_file),
             logging.StreamHandler(),
         ],
     )
@@ -58,22 +128,11 @@ def create_map(data):
     Returns:
         folium.Map: The created map.
     """
-
-    # Map color code based on sim modem signal quality
-    def get_color(quality):
-        if quality <= 20:
-            return 'red'
-        elif quality <= 30:
-            return 'orange'
-        elif quality <= 40:
-            return 'lightgreen'
-        else:
-            return 'green'
-
     # Create a folium map centered on the approximate location
     average_lat = data['lat'].mean()
     average_lon = data['lon'].mean()
-    m = folium.Map(location=[average_lat, average_lon], zoom_start=10)
+    # draw the path and the heatmap on one canvas instead of SVG elements
+    m = folium.Map(location=[average_lat, average_lon], zoom_start=10, prefer_canvas=True)
 
     # Create a Polyline for the path
     folium.PolyLine(list(zip(data['lat'], data['lon'])), color='blue', weight=2.5).add_to(m)
@@ -82,313 +141,444 @@ def create_map(data):
     heatmap = folium.plugins.HeatMap(list(zip(data['lat'], data['lon'], data['quality'])))
     heatmap.add_to(m)
 
-    # Create a MarkerCluster for interactive markers
-    marker_cluster = MarkerCluster(max_cluster_size=50, zoom_start=5)
-
-    for index, row in data.iterrows():
-        popup_content = (f"Timestamp: {row['timestamp']}<br>Quality: "
-                         f"{row['quality']}<br>Average CNo: {row['average_cno']}")
-        marker = folium.Marker([row['lat'], row['lon']], popup=popup_content,
-                               icon=folium.Icon(color=get_color(row['quality'])))
-        marker_cluster.add_child(marker)
-
+    # Map color code based on sim modem signal quality
+    colors = pd.cut(data['quality'], bins=[-np.inf, 20, 30, 40, np.inf],
+                    labels=['red', 'orange', 'lightgreen', 'green']).astype(str)
+    popups = ("Timestamp: " + data['timestamp'].astype(str) + "<br>Quality: " + data['quality'].astype(str)
+              + "<br>Average CNo: " + data['average_cno'].astype(str))
+
+    # Create a MarkerCluster for interactive markers, the markers are built in the browser
+    # and added in chunks, single markers are shown from zoom level 14
+    marker_cluster = FastMarkerCluster(list(zip(data['lat'].tolist(), data['lon'].tolist(), colors.tolist(),
+                                                popups.tolist())),
+                                       callback=MAP_MARKER_CALLBACK, max_cluster_size=50, zoom_start=5,
+                                       chunked_loading=True, disable_clustering_at_zoom=14)
     m.add_child(marker_cluster)
 
     return m
 
 
-def extract_value_from_string(string, key):
-    """Extracts a value from a string based on a given key.
+def save_map(data, output_file):
+    """Creates a folium map with the given data and saves it in an html file.
+
+    Args:
+        data (pd.DataFrame): DataFrame containing latitude, longitude, and quality data.
+        output_file (str): Path to the output html file.
+    """
+    create_map(data).save(output_file)
+
+
+def map_sinr_to_db(sinr_value):
+    """Maps SINR values to dB.
 
     Args:
-        string (str): The string to extract the value from.
-        key (str): The key to identify the value.
+        sinr_value (np.ndarray): The SINR values.
 
     Returns:
-        int or float: The extracted value if found, None otherwise.
+        np.ndarray: The SINR values in dB, NaN where a SINR value is missing or outside the valid range 0 to 250.
     """
-    try:
-        parts = string.split("=")
-        if parts[0] == key:
-            return int(parts[1]) if parts[1].isdigit() else float(parts[1])
-    except (IndexError, ValueError):
-        logger.warning(f"extract_value_from_string: Error extracting value from string: {string}, key: {key}")
-    return None
+    sinr_value = np.asarray(sinr_value, dtype=np.float64)
+    return np.where((sinr_value >= 0) & (sinr_value <= 250), sinr_value // 5 - 20, np.nan)
+
+
+def calculate_signal_quality(rsrp, rssi, rsrq, sinr):
+    """Calculates signal quality based on RSRP, RSSI, RSRQ, and SINR values.
+
+    Args:
+        rsrp (np.ndarray): Reference Signal Received Power (RSRP) values.
+        rssi (np.ndarray): Received Signal Strength Indicator (RSSI) values.
+        rsrq (np.ndarray): Reference Signal Received Quality (RSRQ) values.
+        sinr (np.ndarray): Signal-to-Interference-plus-Noise Ratio (SINR) values.
+
+    Returns:
+        np.ndarray: Calculated signal quality, NaN where any of the values is missing.
+    """
+    rsrp, rssi, rsrq, sinr = (np.asarray(values, dtype=np.float64) for values in (rsrp, rssi, rsrq, sinr))
+
+    # Map RSRP to quality percentage
+    rsrp_quality = RSRP_QUALITY[np.searchsorted(RSRP_THRESHOLDS, rsrp, side='right')]
+
+    # Map RSSI to quality percentage
+    rssi_quality = RSSI_QUALITY[np.searchsorted(RSSI_THRESHOLDS, rssi, side='right')]
+
+    # Map RSRQ to quality percentage
+    rsrq_quality = RSRQ_QUALITY[np.searchsorted(RSRQ_THRESHOLDS, rsrq, side='right')]
+
+    # Map SINR to quality percentage
+    sinr_quality = SINR_QUALITY[np.searchsorted(SINR_THRESHOLDS, sinr, side='right')]
 
+    # Calculate overall signal quality
+    quality = (rsrp_quality + rssi_quality + rsrq_quality + sinr_quality) / 4
+    return np.where(np.isnan(rsrp) | np.isnan(rssi) | np.isnan(rsrq) | np.isnan(sinr), np.nan, quality)
 
-def extract_value_from_variable_string(string, delimiter):
-    """Extracts a value from a string with a delimiter.
+
+def read_log_lines(file_path):
+    """Reads all lines of a log file in one pass of the pyarrow CSV reader.
 
     Args:
-        string (str): The string to extract the value from.
-        delimiter (str): The delimiter separating the key and value.
+        file_path (str): Path to the log file.
 
     Returns:
-        int or float: The extracted value if found, None otherwise.
+        pd.Series: The non-empty lines of the log file as pyarrow strings, empty if the file has no lines.
     """
     try:
-        parts = string.split(delimiter)
-        return int(parts[1]) if parts[1].isdigit() else float(parts[1])
-    except (IndexError, ValueError):
-        logger.warning(f"extract_value_from_variable_string: Error extracting value "
-                       f"from variable string: {string}, delimiter: {delimiter}")
-    return None
+        return pd.read_csv(file_path, sep=LOG_LINE_SEPARATOR, header=None, names=['line'], engine='pyarrow',
+                           dtype='large_string[pyarrow]')['line']
+    except (pd.errors.EmptyDataError, pd.errors.ParserError):
+        # the pyarrow reader fails on empty files and files of blank lines only
+        with open(file_path, 'r') as f:
+            if f.read().strip():
+                raise
+        return pd.Series([], name='line', dtype='large_string[pyarrow]')
 
 
-def find_substring_in_string(string, key_string):
-    """Checks if a substring exists within a string.
+def extract_ubx_fields(ubx_lines, fields):
+    """Extracts numeric fields of decoded UBX messages into columns of the dtype of each field.
 
     Args:
-        string (str): The string to search.
-        key_string (str): The substring to find.
+        ubx_lines (pd.Series): Decoded UBX log lines of one message type.
+        fields (dict): Field names and their dtype, integer dtypes only match integer values.
 
     Returns:
-        bool: True if the substring is found, False otherwise.
+        pd.DataFrame: One column per field and one row per message, missing where a message lacks the field.
     """
-    return key_string in string
+    columns = {}
+    for name, dtype in fields.items():
+        value_re = UBX_NUMBER_RE if dtype.startswith('float') else UBX_INTEGER_RE
+        columns[name] = ubx_lines.str.extract(rf"[\s,]{name}=(?P<{name}>{value_re})", expand=False).astype(dtype)
+    return pd.DataFrame(columns, index=ubx_lines.index)
 
 
-def safe_fmean(data):
-    """Calculates the mean of a list, handling potential division by zero.
+def carry_forward(values, index):
+    """Carries the values of each UBX message forward to the following log lines until the next message of its type.
 
     Args:
-        data (list): The list of data points.
+        values (pd.DataFrame): Parsed values indexed by the log line of their message.
+        index (pd.Index): All parsed log lines.
 
     Returns:
-        float: The mean of the data or None if the list is empty.
+        pd.DataFrame: The values of the latest message of the type for every log line.
     """
-    return statistics.fmean(data) if data else None
+    owner = pd.Series(values.index, index=values.index).reindex(index).ffill()
+    return values.reindex(owner.to_numpy()).set_axis(index)
+
 
+def split_raw_ubx_frames(raw_lines):
+    """Splits raw hex UBX log lines into the timestamp, message type and payload of each frame.
 
-def safe_max(data):
-    """Finds the maximum value in a list, handling empty lists.
+    Frames are checked for the sync chars, payload length and checksum all frames of one size at once.
 
     Args:
-        data (list): The list of data points.
+        raw_lines (pd.Series): Log lines in the form "timestamp:hex frame".
 
     Returns:
-        int or float: The maximum value in the list or None if empty.
+        pd.DataFrame: timestamp, tag and payload bytes of each valid frame, indexed by its log line.
     """
-    return max(data) if data else None
+    parts = raw_lines.str.extract(UBX_RAW_LINE_RE).dropna()
+    hex_sizes = parts['frame'].str.len().to_numpy(dtype=np.int64)
+    parts = parts[(hex_sizes % 2 == 0) & (hex_sizes >= 16)]
+    sizes = parts['frame'].str.len().to_numpy(dtype=np.int64) // 2
+    starts = np.cumsum(sizes) - sizes
+    data = np.frombuffer(bytes.fromhex(''.join(parts['frame'].tolist())), dtype=np.uint8)
+    message_ids, valid = np.zeros(len(sizes), dtype=np.int64), np.zeros(len(sizes), dtype=bool)
+    for size in np.unique(sizes):
+        rows = np.flatnonzero(sizes == size)
+        frames = data[starts[rows, None] + np.arange(size)].astype(np.int64)
+        # 8-bit Fletcher checksum over class, id, length and payload
+        body = frames[:, 2:-2]
+        ck_a = body.sum(axis=1) & 0xFF
+        ck_b = (body * np.arange(size - 4, 0, -1)).sum(axis=1) & 0xFF
+        valid[rows] = ((frames[:, 0] == 0xB5) & (frames[:, 1] == 0x62)
+                       & (frames[:, 4] + (frames[:, 5] << 8) == size - 8)
+                       & (frames[:, -2] == ck_a) & (frames[:, -1] == ck_b))
+        message_ids[rows] = (frames[:, 2] << 8) | frames[:, 3]
+    payloads = [data[start + 6:start + size - 2].tobytes() for start, size in zip(starts.tolist(), sizes.tolist())]
+    frames = pd.DataFrame({'timestamp': parts['timestamp'],
+                           'tag': pd.Series(message_ids, index=parts.index).map(UBX_MESSAGE_TYPES).fillna('unknown'),
+                           'payload': payloads}, index=parts.index)
+    return frames[valid]
+
+
+def scale_ubx_field(values, scale):
+    """Scales the raw values of a scaled UBX field, rounded like pyubx2 so raw and text logs parse to equal values.
 
+    Args:
+        values (np.ndarray): Raw integer values.
+        scale (float): Scale of the field.
+
+    Returns:
+        np.ndarray: The scaled values.
+    """
+    return np.array([round(value, UBX_SCALE_ROUND) for value in (values * scale).tolist()], dtype=np.float64)
 
-def map_sinr_to_db(sinr_value):
-    """Maps SINR value to dB.
+
+def nav_pvt_values(pvt):
+    """Builds the UTC time and output columns of parsed UBX-NAV-PVT fields.
 
     Args:
-        sinr_value (int): The SINR value.
+        pvt (pd.DataFrame): NAV-PVT fields of each message.
+
+    Returns:
+        pd.DataFrame: UTC time and navigation solution of each message, messages without a valid UTC time are dropped.
+    """
+    utc_fields = pvt[['year', 'month', 'day', 'hour', 'min', 'second']].rename(columns={'min': 'minute'}).dropna()
+    utc_time = pd.to_datetime(utc_fields, errors='coerce')
+    pvt = pvt.loc[utc_fields.index, list(UBX_NAV_PVT_COLUMNS.values())].set_axis(list(UBX_NAV_PVT_COLUMNS), axis=1)
+    pvt.insert(0, 'UTC-Time', utc_time)
+    return pvt[pvt['UTC-Time'].notna()]
 
-    Raises:
-        ValueError: If the SINR value is outside the valid range.
+
+def nav_sat_values(satellites, index):
+    """Builds the number of satellites and CNo statistics for each constellation of UBX-NAV-SAT messages.
+
+    Args:
+        satellites (pd.DataFrame): Constellation and CNo of each satellite, indexed by the log line of its message.
+        index (pd.Index): Log lines of the messages.
 
     Returns:
-        int: The SINR value in dB.
+        pd.DataFrame: Number of satellites and CNo statistics for each constellation of each message.
     """
-    if not isinstance(sinr_value, int):
-        raise ValueError("map_sinr_to_db: sinr_value must be integer")
-    if sinr_value < 0 or sinr_value > 250:
-        raise ValueError("map_sinr_to_db: sinr_value must be between 0 and 250")
-    return sinr_value // 5 - 20
+    sat = satellites.groupby(level=0).size().reindex(index, fill_value=0).to_frame('numSVs')
+    unsupported = ~satellites['gnss_id'].isin(list(UBX_CONSTELLATIONS))
+    if unsupported.any():
+        logger.info(f"nav_sat_values: Unsupported Constellation in {unsupported.sum()} satellites")
+    satellites = satellites[~unsupported].assign(above40=lambda sats: sats['cno'] > 40)
+    cno_stats = satellites.groupby([satellites.index, 'gnss_id']).agg(
+        avg=('cno', 'mean'), max=('cno', 'max'), above40=('above40', 'sum')).unstack()
+    for gnss_id, name in UBX_CONSTELLATIONS.items():
+        for stat, column in (('avg', f'{name}-Avg'), ('max', f'{name}-Max'), ('above40', f'{name}-CNO-G40')):
+            sat[column] = cno_stats[stat][gnss_id] if gnss_id in cno_stats.get(stat, ()) else np.nan
+        sat[f'{name}-CNO-G40'] = sat[f'{name}-CNO-G40'].fillna(0)
+    return sat
+
+
+def parse_nav_pvt(messages):
+    """Parses UBX-NAV-PVT messages.
 
+    Args:
+        messages (pd.Series): Decoded NAV-PVT log lines.
 
-def calculate_signal_quality(rsrp, rssi, rsrq, sinr):
-    """Calculates signal quality based on RSRP, RSSI, RSRQ, and SINR values.
+    Returns:
+        pd.DataFrame: UTC time and navigation solution of each message, messages without a valid UTC time are dropped.
+    """
+    return nav_pvt_values(extract_ubx_fields(messages, UBX_NAV_PVT_FIELDS))
+
+
+def parse_nav_sat(messages):
+    """Parses UBX-NAV-SAT messages.
 
     Args:
-        rsrp (int): Reference Signal Received Power (RSRP) value.
-        rssi (int): Received Signal Strength Indicator (RSSI) value.
-        rsrq (float): Reference Signal Received Quality (RSRQ) value.
-        sinr (int): Signal-to-Interference-plus-Noise Ratio (SINR) value.
+        messages (pd.Series): Decoded NAV-SAT log lines.
 
     Returns:
-        float: Calculated signal quality.
+        pd.DataFrame: Number of satellites and CNo statistics for each constellation of each message.
     """
-    # Map RSRP to quality percentage
-    if rsrp >= -84:
-        rsrp_quality = 40
-    elif rsrp >= -102:
-        rsrp_quality = 30
-    elif rsrp >= -111:
-        rsrp_quality = 20
-    else:
-        rsrp_quality = 10
+    satellites = messages.str.split('gnssId_').explode().str.extract(UBX_SAT_CNO_RE).dropna()
+    satellites['cno'] = satellites['cno'].astype('int64')
+    return nav_sat_values(satellites, messages.index)
 
-    # Map RSSI to quality percentage
-    if rssi >= -65:
-        rssi_quality = 40
-    elif rssi >= -75:
-        rssi_quality = 30
-    elif rssi >= -85:
-        rssi_quality = 20
-    else:
-        rssi_quality = 10
 
-    # Map RSRQ to quality percentage
-    if rsrq >= -5:
-        rsrq_quality = 40
-    elif rssi >= -6:
-        rsrq_quality = 30
-    else:
-        rsrq_quality = 10
+def parse_nav_status(messages):
+    """Parses UBX-NAV-STATUS messages.
 
-    # Map SINR to quality percentage
-    if sinr >= 12.5:
-        sinr_quality = 40
-    elif sinr >= 10:
-        sinr_quality = 30
-    elif sinr >= 7:
-        sinr_quality = 20
-    else:
-        sinr_quality = 10
+    Args:
+        messages (pd.Series): Decoded NAV-STATUS log lines.
 
-    # Calculate overall signal quality
-    return (rsrp_quality + rssi_quality + rsrq_quality + sinr_quality) / 4
+    Returns:
+        pd.DataFrame: Time to first fix in seconds of each message, messages without ttff are dropped.
+    """
+    return (extract_ubx_fields(messages, UBX_NAV_STATUS_FIELDS) / 1000.00).dropna()
+
+
+def parse_raw_nav_pvt(payloads):
+    """Parses the payloads of raw UBX-NAV-PVT frames.
+
+    Args:
+        payloads (pd.Series): NAV-PVT payload bytes.
+
+    Returns:
+        pd.DataFrame: UTC time and navigation solution of each message, messages with another payload size or
+            without a valid UTC time are dropped.
+    """
+    payloads = payloads[payloads.map(len) == UBX_NAV_PVT_PAYLOAD.itemsize]
+    fields = np.frombuffer(b''.join(payloads), dtype=UBX_NAV_PVT_PAYLOAD)
+    pvt = {name: fields[name] for name in UBX_NAV_PVT_PAYLOAD.names if name != 'flags'}
+    pvt['gnssFixOk'] = fields['flags'] & 1
+    pvt.update({name: scale_ubx_field(pvt[name], scale) for name, scale in UBX_NAV_PVT_SCALES.items()})
+    return nav_pvt_values(pd.DataFrame(pvt, index=payloads.index).astype(UBX_NAV_PVT_FIELDS))
+
+
+def parse_raw_nav_sat(payloads):
+    """Parses the payloads of raw UBX-NAV-SAT frames.
+
+    Args:
+        payloads (pd.Series): NAV-SAT payload bytes.
+
+    Returns:
+        pd.DataFrame: Number of satellites and CNo statistics for each constellation of each message, messages
+            whose size does not match their number of satellites are dropped.
+    """
+    sizes = payloads.map(len)
+    indexes, satellites = [payloads.index[:0]], [pd.DataFrame({'gnss_id': np.empty(0, dtype=np.uint8),
+                                                                'cno': np.empty(0, dtype=np.int64)})]
+    # messages of one size hold the same number of 12 byte satellite blocks after the 8 byte header
+    for size, messages in payloads[(sizes >= 8) & ((sizes - 8) % 12 == 0)].groupby(sizes):
+        num_svs = (size - 8) // 12
+        blocks = np.frombuffer(b''.join(messages), dtype=np.uint8).reshape(len(messages), size)
+        matching = blocks[:, 5] == num_svs
+        svs = blocks[matching, 8:].reshape(matching.sum(), num_svs, 12)
+        indexes.append(messages.index[matching])
+        satellites.append(pd.DataFrame({'gnss_id': svs[:, :, 0].ravel(), 'cno': svs[:, :, 2].ravel().astype(np.int64)},
+                                       index=indexes[-1].repeat(num_svs)))
+    satellites = pd.concat(satellites)
+    gnss_ids = satellites['gnss_id']
+    satellites['gnss_id'] = gnss_ids.map(UBX_GNSS_IDS).fillna(gnss_ids.astype(str))
+    return nav_sat_values(satellites, indexes[0].append(indexes[1:]).sort_values())
+
+
+def parse_raw_nav_status(payloads):
+    """Parses the payloads of raw UBX-NAV-STATUS frames.
+
+    Args:
+        payloads (pd.Series): NAV-STATUS payload bytes.
+
+    Returns:
+        pd.DataFrame: Time to first fix in seconds of each message, messages with another payload size are dropped.
+    """
+    payloads = payloads[payloads.map(len) == UBX_NAV_STATUS_PAYLOAD.itemsize]
+    fields = np.frombuffer(b''.join(payloads), dtype=UBX_NAV_STATUS_PAYLOAD)
+    return pd.DataFrame({'ttff': fields['ttff']}, index=payloads.index).astype(UBX_NAV_STATUS_FIELDS) / 1000.00
+
+
+# parser of each supported UBX message type
+UBX_MESSAGE_PARSERS = {'NAV-SAT': parse_nav_sat, 'NAV-PVT': parse_nav_pvt, 'NAV-STATUS': parse_nav_status}
+# parser of the payloads of each supported UBX message type of raw frames
+UBX_RAW_MESSAGE_PARSERS = {'NAV-SAT': parse_raw_nav_sat, 'NAV-PVT': parse_raw_nav_pvt,
+                           'NAV-STATUS': parse_raw_nav_status}
 
 
 def parse_gnss_log(file_path):
     """Parses GNSS log file and returns a pandas DataFrame.
 
+    Every log line gives one row holding the values of the latest NAV-PVT, NAV-SAT and NAV-STATUS messages.
+
     Args:
         file_path (str): Path to the GNSS log file.
 
     Returns:
         pd.DataFrame: DataFrame containing parsed GNSS data.
     """
-    gnss_data = []
-    (num_svs, utc_time, ttff, gps_avg_cno, gps_max_cno, gps_cno_above40, sbas_avg_cno, sbas_max_cno, sbas_cno_above40,
-     galileo_avg_cno, galileo_max_cno, galileo_cno_above40, beidou_avg_cno, beidou_max_cno, beidou_cno_above40,
-     glonass_avg_cno, glonass_max_cno, glonass_cno_above40, fix_type, gnss_fix_ok, num_sv, lon, lat, h_msl,
-     h_acc, v_acc, g_speed, s_acc, head_acc, p_dop, head_veh) = [None] * 31
-    with open(file_path, 'r') as f:
-        for line_number, line in enumerate(f, start=1):
-            try:
-                timestamp, ubx_data = line.split('<', 1)
-                timestamp = timestamp[:-1]
-                ubx_head, ubx_data = ubx_data.split('(', 1)
-                logger.debug(f"parse_gnss_log: UBX data frame: {ubx_data}")
-                ubx_messages = ubx_data.strip().split(',')
-                match (ubx_messages[0]):
-                    case 'NAV-PVT':
-                        logger.debug(f"parse_gnss_log: NAV-PVT == {ubx_messages[0]}")
-                        utc_year = extract_value_from_string(ubx_messages[2], ' year')
-                        utc_month = extract_value_from_string(ubx_messages[3], ' month')
-                        utc_day = extract_value_from_string(ubx_messages[4], ' day')
-                        utc_hour = extract_value_from_string(ubx_messages[5], ' hour')
-                        utc_min = extract_value_from_string(ubx_messages[6], ' min')
-                        utc_second = extract_value_from_string(ubx_messages[7], ' second')
-                        utc_time = datetime(utc_year, utc_month, utc_day, utc_hour, utc_min, utc_second)
-                        fix_type = extract_value_from_string(ubx_messages[14], ' fixType')
-                        gnss_fix_ok = extract_value_from_string(ubx_messages[15], ' gnssFixOk')
-                        num_sv = extract_value_from_string(ubx_messages[23], ' numSV')
-                        lon = extract_value_from_string(ubx_messages[24], ' lon')
-                        lat = extract_value_from_string(ubx_messages[25], ' lat')
-                        h_msl = extract_value_from_string(ubx_messages[27], ' hMSL')
-                        h_acc = extract_value_from_string(ubx_messages[28], ' hAcc')
-                        v_acc = extract_value_from_string(ubx_messages[29], ' vAcc')
-                        g_speed = extract_value_from_string(ubx_messages[33], ' gSpeed')
-                        s_acc = extract_value_from_string(ubx_messages[35], ' sAcc')
-                        head_acc = extract_value_from_string(ubx_messages[36], ' headAcc')
-                        p_dop = extract_value_from_string(ubx_messages[37], ' pDOP')
-                        head_veh = extract_value_from_string(ubx_messages[41], ' headVeh')
-
-                    case 'NAV-SAT':
-                        logger.debug(f"parse_gnss_log: NAV-SAT == {ubx_messages[0]}\n")
-                        num_svs = extract_value_from_string(ubx_messages[3], ' numSvs')
-                        satellite_gps, satellite_sbas, satellite_galileo = [], [], []
-                        satellite_beidou, satellite_glonass = [], []
-                        for i in range(num_svs):
-                            if find_substring_in_string(ubx_messages[5 + i * 23], 'GPS'):
-                                satellite_gps.append(extract_value_from_variable_string(ubx_messages[7 + i * 23], '='))
-                                logger.debug(f"parse_gnss_log: satellite_gps:{satellite_gps}")
-                            elif find_substring_in_string(ubx_messages[5 + i * 23], 'SBAS'):
-                                satellite_sbas.append(extract_value_from_variable_string(ubx_messages[7 + i * 23], '='))
-                                logger.debug(f"parse_gnss_log: satellite_sbas:{satellite_sbas}")
-                            elif find_substring_in_string(ubx_messages[5 + i * 23], 'Galileo'):
-                                satellite_galileo.append(
-                                    extract_value_from_variable_string(ubx_messages[7 + i * 23], '='))
-                                logger.debug(f"parse_gnss_log: satellite_galileo:{satellite_galileo}")
-                            elif find_substring_in_string(ubx_messages[5 + i * 23], 'BeiDou'):
-                                satellite_beidou.append(
-                                    extract_value_from_variable_string(ubx_messages[7 + i * 23], '='))
-                                logger.debug(f"parse_gnss_log: satellite_beidou:{satellite_beidou}")
-                            elif find_substring_in_string(ubx_messages[5 + i * 23], 'GLONASS'):
-                                satellite_glonass.append(
-                                    extract_value_from_variable_string(ubx_messages[7 + i * 23], '='))
-                                logger.debug(f"parse_gnss_log: satellite_glonass:{satellite_glonass}")
-                            else:
-                                logger.info("parse_gnss_log: Unsupported Constellation")
-                        # UBX-NAV-SAT parameters for each constellation
-                        logger.debug(f"parse_gnss_log: gps list = {satellite_gps}\n")
-                        gps_avg_cno = safe_fmean(satellite_gps)
-                        gps_max_cno = safe_max(satellite_gps)
-                        gps_cno_above40 = np.sum(np.array(satellite_gps) > 40)
-
-                        logger.debug(f"parse_gnss_log: sbas list = {satellite_sbas}\n")
-                        sbas_avg_cno = safe_fmean(satellite_sbas)
-                        sbas_max_cno = safe_max(satellite_sbas)
-                        sbas_cno_above40 = np.sum(np.array(satellite_sbas) > 40)
-
-                        logger.debug(f"parse_gnss_log: galileo list = {satellite_galileo}\n")
-                        galileo_avg_cno = safe_fmean(satellite_galileo)
-                        galileo_max_cno = safe_max(satellite_galileo)
-                        galileo_cno_above40 = np.sum(np.array(satellite_galileo) > 40)
-
-                        logger.debug(f"parse_gnss_log: beidou list = {satellite_beidou}\n")
-                        beidou_avg_cno = safe_fmean(satellite_beidou)
-                        beidou_max_cno = safe_max(satellite_beidou)
-                        beidou_cno_above40 = np.sum(np.array(satellite_beidou) > 40)
-
-                        logger.debug(f"parse_gnss_log: glonass list = {satellite_glonass}\n")
-                        glonass_avg_cno = safe_fmean(satellite_glonass)
-                        glonass_max_cno = safe_max(satellite_glonass)
-                        glonass_cno_above40 = np.sum(np.array(satellite_glonass) > 40)
-
-                    case 'NAV-STATUS':
-                        logger.debug(f"parse_gnss_log: NAV-STATUS == {ubx_messages[0]}\n")
-                        ttff = (extract_value_from_string(ubx_messages[13], ' ttff')) / 1000.00
-                        logger.debug(f"parse_gnss_log: ttff: {ttff}")
-
-                    case _:
-                        logger.info("parse_gnss_log: Unsupported UBX MSG type")
-
-                # all parameters to append to gnss panda frame
-                gnss_data.append(
-                    [timestamp, utc_time, num_svs, ttff, gps_avg_cno, gps_max_cno, gps_cno_above40, sbas_avg_cno,
-                     sbas_max_cno, sbas_cno_above40, galileo_avg_cno, galileo_max_cno, galileo_cno_above40,
-                     beidou_avg_cno, beidou_max_cno, beidou_cno_above40, glonass_avg_cno, glonass_max_cno,
-                     glonass_cno_above40, fix_type, gnss_fix_ok, num_sv, lon, lat, h_msl, h_acc, v_acc, g_speed,
-                     s_acc, head_acc, p_dop, head_veh])
-            except Exception as e:
-                logger.error(f"parse_gnss_log: Error parsing line {line_number}: {e}")
-    return pd.DataFrame(gnss_data,
-                        columns=['timestamp', 'UTC-Time', 'numSVs', 'ttff', 'GPS-Avg', 'GPS-Max', 'GPS-CNO-G40',
-                                 'SBAS-Avg', 'SBAS-Max', 'SBAS-CNO-G40', 'Galileo-Avg', 'Galileo-Max',
-                                 'Galileo-CNO-G40', 'BeiDou-Avg', 'BeiDou-Max', 'BeiDou-CNO-G40', 'Glonass-Avg',
-                                 'Glonass-Max', 'Glonass-CNO-G40', 'fix_type', 'gnss_fix_ok', 'num_sv', 'lon', 'lat',
-                                 'h_msl', 'h_acc', 'v_acc', 'g_speed', 's_acc', 'head_acc', 'p_dop', 'head_veh'])
+    lines = read_log_lines(file_path)
+    if lines.empty:
+        logger.info(f"parse_gnss_log: No lines in {file_path}")
+        return pd.DataFrame(columns=GNSS_COLUMNS)
+    raw_lines = ~lines.str.contains('<', regex=False)
+    # decoded UBX text lines and raw hex frames, which are parsed from the frame bytes without decoding to text
+    frames = lines[~raw_lines].str.extract(UBX_LINE_RE).dropna(subset=['tag'])
+    raw_frames = split_raw_ubx_frames(lines[raw_lines])
+    if len(frames) + len(raw_frames) < len(lines):
+        logger.error(f"parse_gnss_log: Error parsing {len(lines) - len(frames) - len(raw_frames)} lines")
+
+    # parse all messages of each UBX message type at once
+    message_values, invalid, unsupported = {}, pd.Index([], dtype='int64'), 0
+    for parsers, messages_of_type in ((UBX_MESSAGE_PARSERS, lines[frames.index].groupby(frames['tag'], sort=False)),
+                                      (UBX_RAW_MESSAGE_PARSERS,
+                                       raw_frames['payload'].groupby(raw_frames['tag'], sort=False))):
+        for tag, messages in messages_of_type:
+            parse_messages = parsers.get(tag)
+            if parse_messages is None:
+                unsupported += len(messages)
+                continue
+            values = parse_messages(messages)
+            message_values.setdefault(tag, []).append(values)
+            invalid = invalid.union(messages.index.difference(values.index))
+    if unsupported:
+        logger.info(f"parse_gnss_log: Unsupported UBX MSG type in {unsupported} lines")
+
+    # messages dropped by their parser are skipped like the unparsable lines
+    if not invalid.empty:
+        logger.error(f"parse_gnss_log: Error parsing {len(invalid)} UBX messages")
+    timestamps = pd.concat([frames['timestamp'], raw_frames['timestamp']]).sort_index()
+    index = timestamps.index.difference(invalid)
+    gnss_data = pd.concat([timestamps[index].to_frame('timestamp')] +
+                          [carry_forward(pd.concat(values).sort_index(), index) for values in message_values.values()],
+                          axis=1)
+    gnss_data['timestamp'] = gnss_data['timestamp'].astype(str)
+    return gnss_data.reindex(columns=GNSS_COLUMNS).reset_index(drop=True)
 
 
 def parse_line(line):
-    try:
-        # Split by '#'
-        parts = line.split('#')
-        timestamp = parts[0]
-        timestamp = timestamp[:-1]
-        rfsts_data = parts[1] if len(parts) > 1 else None
-        server_data = parts[2] if len(parts) > 2 else None
-        sock_info_data = parts[3] if len(parts) > 3 else None
-        sock_status_data = parts[4] if len(parts) > 4 else None
-
-        # Split by '+'
-        parts1 = line.split('+')
-        nw_eps_data = parts1[1] if len(parts1) > 1 else None
-        nw_data = parts1[2] if len(parts1) > 2 else None
-
-        logger.debug(f"parse_line: {timestamp, rfsts_data, server_data, sock_info_data, sock_status_data,nw_eps_data, nw_data}")
-        return timestamp, rfsts_data, server_data, sock_info_data, sock_status_data, nw_eps_data, nw_data
-    except (IndexError, ValueError) as e:
-        logger.info(f"parse_line: Error parsing line: {e}")
-        return None, None, None, None, None, None
+    # Split by '#'
+    parts = line.split('#')
+    timestamp = parts[0]
+    timestamp = timestamp[:-1]
+    rfsts_data = parts[1] if len(parts) > 1 else None
+    server_data = parts[2] if len(parts) > 2 else None
+    sock_info_data = parts[3] if len(parts) > 3 else None
+    sock_status_data = parts[4] if len(parts) > 4 else None
+
+    # Split by '+'
+    parts1 = line.split('+')
+    nw_eps_data = parts1[1] if len(parts1) > 1 else None
+    nw_data = parts1[2] if len(parts1) > 2 else None
+
+    logger.debug("parse_line: %s", (timestamp, rfsts_data, server_data, sock_info_data, sock_status_data,
+                                     nw_eps_data, nw_data))
+    return timestamp, rfsts_data, server_data, sock_info_data, sock_status_data, nw_eps_data, nw_data
+
+
+def parse_modem_responses(values, rfsts_data, server_data, sock_info_data, sock_status_data, nw_eps_data, nw_data):
+    """Parses the AT command responses of one SIM modem log line.
+
+    Every response is validated before it is parsed so a malformed line updates none of the values.
+
+    Args:
+        values (tuple): rsrp, rssi, rsrq, sinr, server_msg, sock_info, sock_status, nw_eps_status and nw_status of
+            the latest responses.
+        rfsts_data (str): #RFSTS response or None.
+        server_data (str): #MSG response or None.
+        sock_info_data (str): #SI response or None.
+        sock_status_data (str): #SS response or None.
+        nw_eps_data (str): +CEREG response or None.
+        nw_data (str): +CREG response or None.
+
+    Returns:
+        tuple: The values updated by the responses present in the line, None if any of them is malformed.
+    """
+    rsrp, rssi, rsrq, sinr, server_msg, sock_info, sock_status, nw_eps_status, nw_status = values
+    if rfsts_data is not None and "RFSTS" in rfsts_data:
+        rfsts_fields = rfsts_data.partition(':')[2].split(',')
+        if len(rfsts_fields) < 19:
+            return None
+        rsrp, rssi, rsrq, sinr = rfsts_fields[2], rfsts_fields[3], rfsts_fields[4], rfsts_fields[18].partition(':')[0]
+        # integers and the decimal fraction of the RSRQ, e.g. "-100" and "-5.5"
+        if not (rsrp.removeprefix('-').isdecimal() and rssi.removeprefix('-').isdecimal() and
+                rsrq.removeprefix('-').replace('.', '', 1).isdecimal() and sinr.removeprefix('-').isdecimal()):
+            return None
+        rsrp, rssi, rsrq, sinr = int(rsrp), int(rssi), float(rsrq), int(sinr)
+    if server_data is not None and "MSG" in server_data:
+        head, sep, server_msg = server_data.partition(':')
+        if not sep:
+            return None
+    if sock_info_data is not None and "SI" in sock_info_data:
+        head, sep, sock_info = sock_info_data.partition(':')
+        if not sep:
+            return None
+    if sock_status_data is not None and "SS" in sock_status_data:
+        status = sock_status_data.split(':', 2)
+        if len(status) < 3 or ',' not in status[1]:
+            return None
+        sock_status = status[1].split(",", 2)[1]
+    if nw_eps_data is not None and "CEREG" in nw_eps_data:
+        head, sep, nw_eps_status = nw_eps_data.partition(':')
+        if not sep:
+            return None
+        nw_eps_status = nw_eps_status.replace(":", "")
+    if nw_data is not None and "CREG" in nw_data:
+        head, sep, nw_status = nw_data.partition(':')
+        if not sep:
+            return None
+    return rsrp, rssi, rsrq, sinr, server_msg, sock_info, sock_status, nw_eps_status, nw_status
 
 
 def parse_pump_modem_log(file_path):
@@ -401,16 +591,16 @@ def parse_pump_modem_log(file_path):
         pd.DataFrame: DataFrame containing parsed SIM modem data.
     """
     sim_modem_data = []
+    is_debug = logger.isEnabledFor(logging.DEBUG)
     # (timestamp, phone_status) = [None] * 2
     with (open(file_path, 'r') as f):
-        for line_number, line in enumerate(f, start=1):
-            logger.debug(f"parse_pump_modem_log: read line: {line_number}:{line}")
-            try:
-                timestamp, phone_mode, drop1, drop2, drop3, drop4, drop5 = parse_line(line)
-                logger.debug(f"parse_pump_modem_log:  phone_mode: {phone_mode}")
-                sim_modem_data.append([timestamp, phone_mode])
-            except Exception as e:
-                logger.error(f"parse_pump_modem_log: Error parsing line {line_number}: {e}")
+        for line_number, line in enumerate(f.readlines(), start=1):
+            if is_debug:
+                logger.debug("parse_pump_modem_log: read line: %s:%s", line_number, line)
+            timestamp, phone_mode, drop1, drop2, drop3, drop4, drop5 = parse_line(line)
+            if is_debug:
+                logger.debug("parse_pump_modem_log:  phone_mode: %s", phone_mode)
+            sim_modem_data.append([timestamp, phone_mode])
     return pd.DataFrame(sim_modem_data, columns=['timestamp', 'phone_mode'])
 
 
@@ -423,50 +613,47 @@ def parse_sim_modem_log(file_path):
     Returns:
         pd.DataFrame: DataFrame containing parsed SIM modem data.
     """
-    sim_modem_data = []
-    (timestamp, rsrp, rssi, rsrq, sinr_in_db, quality, server_msg, sock_info, sock_status,
-     nw_eps_status, nw_status) = [None] * 11
+    # rsrp, rssi, rsrq, sinr, server_msg, sock_info, sock_status, nw_eps_status and nw_status of the latest responses
+    values = (np.nan,) * 4 + (None,) * 5
+    is_debug = logger.isEnabledFor(logging.DEBUG)
     with (open(file_path, 'r') as f):
-        for line_number, line in enumerate(f, start=1):
-            logger.debug(f"parse_sim_modem_log: read line: {line_number}:{line}")
-            try:
-                timestamp, rfsts_data, server_data, sock_info_data, sock_status_data, nw_eps_data, nw_data = parse_line(
-                    line)
-
-                if rfsts_data is not None and "RFSTS" in rfsts_data:
-                    head, rfsts_data = rfsts_data.split(':', 1)
-                    rsrp = int(rfsts_data.split(',')[2])  # Example: extract RSRP
-                    rssi = int(rfsts_data.split(',')[3])  # Example: extract RSSI
-                    rsrq = float(rfsts_data.split(',')[4])  # Example: extract RSRQ
-                    sinr = int(rfsts_data.split(',')[18].split(':')[0])  # Example: extract SINR
-                    sinr_in_db = map_sinr_to_db(sinr)
-                    quality = calculate_signal_quality(rsrp, rssi, rsrq, sinr)
-                if server_data is not None and "MSG" in server_data:
-                    head, server_msg = server_data.split(':', 1)
-                if sock_info_data is not None and "SI" in sock_info_data:
-                    head, sock_info = sock_info_data.split(':', 1)
-                if sock_status_data is not None and "SS" in sock_status_data:
-                    head, status, drop = sock_status_data.split(':', 2)
-                    sock_status = status.split(",", 2)[1]
-                if nw_eps_data is not None and "CEREG" in nw_eps_data:
-                    head, nw_eps_status = nw_eps_data.split(':', 1)
-                    nw_eps_status = nw_eps_status.replace(":", "")
-                if nw_data is not None and "CREG" in nw_data:
-                    head, nw_status = nw_data.split(':', 1)
-                logger.debug(f"parse_sim_modem_log:  rfsts_data: {rfsts_data}, server_msg: {server_msg}, "
-                             f"sock_info: {sock_info},sock_status: {sock_status}, sinr_in_db: {sinr_in_db}, "
-                             f" quality: {quality}, nw_eps_status: {nw_eps_status}, nw_status: {nw_status}")
-                sim_modem_data.append([timestamp, rsrp, rssi, rsrq, sinr_in_db, quality, server_msg, sock_info,
-                                       sock_status, nw_eps_status, nw_status])
-            except Exception as e:
-                logger.error(f"parse_sim_modem_log: Error parsing line {line_number}: {e}")
-    return pd.DataFrame(sim_modem_data, columns=['timestamp', 'rsrp', 'rssi', 'rsrq', 'sinr', 'quality',
-                                                 'server_msg', 'sock_info', 'sock_status', 'cereg', 'creg'])
+        lines = f.readlines()
+    # one preallocated array per column, written by row and cut to the parsed rows at the end
+    timestamps, server_msgs, sock_infos, sock_statuses, nw_eps_statuses, nw_statuses = (
+        np.empty(len(lines), dtype=object) for _ in range(6))
+    rsrps, rssis, rsrqs, sinrs = (np.full(len(lines), np.nan) for _ in range(4))
+    row = 0
+    for line_number, line in enumerate(lines, start=1):
+        if is_debug:
+            logger.debug("parse_sim_modem_log: read line: %s:%s", line_number, line)
+        timestamp, rfsts_data, *responses = parse_line(line)
+        line_values = parse_modem_responses(values, rfsts_data, *responses)
+        if line_values is None:
+            logger.error(f"parse_sim_modem_log: Error parsing line {line_number}: malformed response")
+            continue
+        values = line_values
+        if is_debug:
+            logger.debug("parse_sim_modem_log:  rfsts_data: %s, values: %s", rfsts_data, values)
+        timestamps[row] = timestamp
+        (rsrps[row], rssis[row], rsrqs[row], sinrs[row], server_msgs[row], sock_infos[row], sock_statuses[row],
+         nw_eps_statuses[row], nw_statuses[row]) = values
+        row += 1
+    # signal quality and SINR in dB of all lines at once
+    rsrps, rssis, rsrqs, sinrs = rsrps[:row], rssis[:row], rsrqs[:row], sinrs[:row]
+    sinr_in_db = map_sinr_to_db(sinrs)
+    quality = calculate_signal_quality(rsrps, rssis, rsrqs, np.where(np.isnan(sinr_in_db), np.nan, sinrs))
+    return pd.DataFrame({'timestamp': timestamps[:row], 'rsrp': rsrps, 'rssi': rssis, 'rsrq': rsrqs,
+                         'sinr': sinr_in_db, 'quality': quality, 'server_msg': server_msgs[:row],
+                         'sock_info': sock_infos[:row], 'sock_status': sock_statuses[:row],
+                         'cereg': nw_eps_statuses[:row], 'creg': nw_statuses[:row]}, copy=False)
 
 
 def merge_dataframes(gnss_dataframe, sim_modem_dataframe):
     """Merges GNSS and SIM modem dataframes based on timestamp.
 
+    Every GNSS row gets the SIM modem row nearest in time within one second, both logs are written in timestamp
+    order so the merge is a sorted scan over datetime timestamps instead of a hash join on the timestamp strings.
+
     Args:
         gnss_dataframe (pd.DataFrame): DataFrame containing GNSS data.
         sim_modem_dataframe (pd.DataFrame): DataFrame containing SIM modem data.
@@ -474,26 +661,48 @@ def merge_dataframes(gnss_dataframe, sim_modem_dataframe):
     Returns:
         pd.DataFrame: Merged DataFrame.
     """
-    return gnss_dataframe.merge(sim_modem_dataframe, on='timestamp', how='outer')
+    # one datetime unit on both sides, pandas infers the unit of each column and an empty column gets seconds
+    gnss_dataframe, sim_modem_dataframe = (
+        dataframe.assign(timestamp=pd.to_datetime(dataframe['timestamp'].str.rstrip(':'), format=LOG_TIMESTAMP_FORMAT,
+                                                  errors='coerce', cache=True).astype('datetime64[ns]'))
+        .dropna(subset=['timestamp']).sort_values('timestamp', kind='stable')
+        for dataframe in (gnss_dataframe, sim_modem_dataframe))
+    return pd.merge_asof(gnss_dataframe, sim_modem_dataframe, on='timestamp', direction='nearest',
+                         tolerance=pd.Timedelta(seconds=1))
+
+
+def write_dataframe(dataframe, output_file):
+    """Writes a dataframe to a Parquet file if the output file ends with .parquet, otherwise to an Excel file.
+
+    Args:
+        dataframe (pd.DataFrame): DataFrame to be written.
+        output_file (str): Path to the output file.
+    """
+    if output_file.endswith('.parquet'):
+        dataframe.to_parquet(output_file, compression='zstd', index=False)
+    else:
+        # xlsxwriter writes the workbook faster than openpyxl, constant memory mode is not usable as pandas writes
+        # the cells column by column and xlsxwriter drops the cells of rows it already flushed
+        dataframe.to_excel(output_file, index=False, engine='xlsxwriter')
 
 
 def export_to_excel(merged_dataframe, output_file, skip_empty=1):
-    """Exports merged dataframe to Excel.
+    """Exports merged dataframe to Excel, or to Parquet if the output file ends with .parquet.
 
     Args:
         merged_dataframe (pd.DataFrame): DataFrame to be exported.
-        output_file (str): Path to the output Excel file.
+        output_file (str): Path to the output Excel or Parquet file.
         skip_empty (bool, optional): If True, skips Excel write if modem data is empty. Defaults to True.
     """
     if skip_empty:
         last_5_columns = merged_dataframe.iloc[:, -5:]
         complete_rows = merged_dataframe[~last_5_columns.isnull().any(axis=1)]
         if not complete_rows.empty:
-            complete_rows.to_excel(output_file, index=False)
+            write_dataframe(complete_rows, output_file)
         else:
             logger.info("export_to_excel: Last 5 data frames empty, skipping Excel write...")
     else:
-        merged_dataframe.to_excel(output_file, index=False)
+        write_dataframe(merged_dataframe, output_file)
 
 
 if __name__ == "__main__":
@@ -503,39 +712,37 @@ if __name__ == "__main__":
     match SELECT_PARSING:
         case 1:
             logger.info("Main: SELECT_PARSING set to Both")
-            gnss_df = parse_gnss_log(GNSS_LOG_FILE)
-            logger.debug(f"Main: gnss_df {gnss_df}")
-            sim_modem_df = parse_sim_modem_log(SIM_MODEM_LOG_FILE)
-            logger.debug(f"Main: sim_modem_df {sim_modem_df}")
-            logger.info(f"Main: Data parsing completed in {time.time() - start_time:.2f} seconds")
-            merged_df = merge_dataframes(gnss_df, sim_modem_df)
-            if ENABLE_MAPPING:
-                # Extract relevant data for mapping
-                map_data = merged_df[
-                    ['timestamp', 'lat', 'lon', 'quality', 'GPS-Max', 'SBAS-Max', 'Galileo-Max', 'BeiDou-Max',
-                     'Glonass-Max']]
-                # Handle NaN values and Calculate overall average of max CNo of each constellation
-                map_data = map_data.dropna(subset=['timestamp', 'lat', 'lon', 'quality'])
-                map_data['average_cno'] = map_data[
-                    ['GPS-Max', 'SBAS-Max', 'Galileo-Max', 'BeiDou-Max', 'Glonass-Max']].mean(
-                    axis=1)
-
-                # Remove colons from timestamp
-                map_data['timestamp'] = map_data['timestamp'].astype(str).str[:-1]
-                # Assuming your timestamp format is YYYY-MM-DD HH:MM:SS
-                map_data['timestamp'] = pd.to_datetime(map_data['timestamp'], format='%Y-%m-%d %H:%M:%S')
-
-                # Time-based binning (adjust time interval as needed) 1Min or 10S
-                map_data['timestamp_bin'] = map_data['timestamp'].dt.floor('10s')
-                # Group data by time bin and calculate averages
-                aggregated_data = map_data.groupby('timestamp_bin').mean().reset_index()
-
-                # Create and display the map
-                plot_map = create_map(aggregated_data)
-                plot_map.save(OUTPUT_MAP_FILE)  # save the map in html file
-            else:
-                logger.info("Main: Mapping is disabled.")
-            export_to_excel(merged_df, OUTPUT_EXCEL_FILE, SKIP_EMPTY)
+            with ProcessPoolExecutor(max_workers=2, initializer=configure_logging,
+                                     initargs=(DYNAMIC_PARSER_LOG_FILE,)) as executor:
+                # the logs are independent, parse them in parallel processes
+                gnss_future = executor.submit(parse_gnss_log, GNSS_LOG_FILE)
+                sim_modem_future = executor.submit(parse_sim_modem_log, SIM_MODEM_LOG_FILE)
+                gnss_df, sim_modem_df = gnss_future.result(), sim_modem_future.result()
+                logger.debug(f"Main: gnss_df {gnss_df}")
+                logger.debug(f"Main: sim_modem_df {sim_modem_df}")
+                logger.info(f"Main: Data parsing completed in {time.time() - start_time:.2f} seconds")
+                merged_df = merge_dataframes(gnss_df, sim_modem_df)
+                map_future = None
+                if ENABLE_MAPPING:
+                    # Handle NaN values and Calculate overall average of max CNo of each constellation
+                    map_data = merged_df.dropna(subset=['timestamp', 'lat', 'lon', 'quality'])
+                    map_data = map_data.assign(average_cno=map_data[
+                        ['GPS-Max', 'SBAS-Max', 'Galileo-Max', 'BeiDou-Max', 'Glonass-Max']].mean(axis=1))
+                    # Extract relevant data for mapping
+                    map_data = map_data[['timestamp', 'lat', 'lon', 'quality', 'average_cno']]
+
+                    # Time-based binning (adjust time interval as needed) 1Min or 10S
+                    # Calculate averages of each time bin, bins without data are dropped
+                    aggregated_data = map_data.set_index('timestamp').resample('10s').mean().dropna(
+                        subset=['lat', 'lon', 'quality']).reset_index()
+
+                    # Create the map and save it in html file while the Excel file is written
+                    map_future = executor.submit(save_map, aggregated_data, OUTPUT_MAP_FILE)
+                else:
+                    logger.info("Main: Mapping is disabled.")
+                export_to_excel(merged_df, OUTPUT_EXCEL_FILE, SKIP_EMPTY)
+                if map_future is not None:
+                    map_future.result()
             logger.info("Main: Data processing finished...")
         case 2:
             logger.info("Main: SELECT_PARSING set to Only GNSS")
@@ -553,9 +760,13 @@ if __name__ == "__main__":
             logger.info("Main: Data processing finished...")
         case 4:
             logger.info("Main: SELECT_PARSING set to Pump Modem")
-            gnss_df = parse_gnss_log(GNSS_LOG_FILE)
+            with ProcessPoolExecutor(max_workers=2, initializer=configure_logging,
+                                     initargs=(DYNAMIC_PARSER_LOG_FILE,)) as executor:
+                # the logs are independent, parse them in parallel processes
+                gnss_future = executor.submit(parse_gnss_log, GNSS_LOG_FILE)
+                pump_sim_modem_future = executor.submit(parse_pump_modem_log, SIM_MODEM_LOG_FILE)
+                gnss_df, pump_sim_modem_df = gnss_future.result(), pump_sim_modem_future.result()
             logger.debug(f"Main: gnss_df {gnss_df}")
-            pump_sim_modem_df = parse_pump_modem_log(SIM_MODEM_LOG_FILE)
             logger.debug(f"Main: sim_modem_df {pump_sim_modem_df}")
             logger.info(f"Main: Data parsing completed in {time.time() - start_time:.2f} seconds")
             merged_df = merge_dataframes(gnss_df, pump_sim_modem_df)